@@ -1,11 +1,16 @@
 import json
+import re
 import discord
 import requests
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import Button, View
 import asyncio
+import os
+import sys
+import time
 import sqlite3
+from datetime import datetime
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 
@@ -20,6 +25,7 @@ tree = bot.tree
 
 Game_status = 0
 leaderboard_visible = True
+backup_task = None
 
 # Load configuration file
 config_file = open("config.json")
@@ -27,6 +33,8 @@ config = json.load(config_file)
 # Database setup
 db = sqlite3.connect("game.db")
 cursor = db.cursor()
+# WAL lets the backup task read a consistent snapshot while the bot keeps committing.
+cursor.execute("PRAGMA journal_mode=WAL")
 
 cursor.execute('''CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, discord_id INTEGER, team_id INTEGER)''')
 cursor.execute('''CREATE TABLE IF NOT EXISTS teams (id INTEGER PRIMARY KEY, name TEXT, points INTEGER)''')
@@ -38,11 +46,137 @@ cursor.execute('''CREATE TABLE IF NOT EXISTS submissions (
     message_id INTEGER,
     status TEXT,
     photo_url TEXT,
+    pending_since REAL,
     UNIQUE(team_id, task_id)
 )''')
 
+# Add submissions.pending_since to databases created before it existed.
+# Submissions already waiting for review are aged from the migration.
+def migrate_submissions():
+    cursor.execute("PRAGMA table_info(submissions)")
+    if not any(column[1] == "pending_since" for column in cursor.fetchall()):
+        cursor.execute("ALTER TABLE submissions ADD COLUMN pending_since REAL")
+        cursor.execute(
+            "UPDATE submissions SET pending_since = ? WHERE status = 'Pending' AND photo_url IS NOT NULL",
+            (time.time(),)
+        )
+        db.commit()
+
+migrate_submissions()
+
 db.commit()
 
+# Backup settings
+BACKUP_DIR = config.get("backup_dir", "backups")
+BACKUP_INTERVAL = config.get("backup_interval", 300)  # Seconds between snapshots.
+BACKUP_KEEP = config.get("backup_keep", 48)  # Number of snapshots to keep.
+BACKUP_PAGES = config.get("backup_pages", 64)  # Pages copied per backup step.
+
+def list_backups():
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    return sorted(name for name in os.listdir(BACKUP_DIR) if name.startswith("game-") and name.endswith(".db"))
+
+def remove_backup(name):
+    for suffix in ("", "-wal", "-shm"):
+        path = os.path.join(BACKUP_DIR, name + suffix)
+        if os.path.exists(path):
+            os.remove(path)
+
+# Runs in a worker thread with its own connection, so the bot's connection is never held.
+# The online backup API copies a few pages at a time and yields between steps.
+# Snapshots named in keep are never pruned.
+def backup_database(keep=()):
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    name = datetime.now().strftime("game-%Y%m%d-%H%M%S-%f.db")
+    path = os.path.join(BACKUP_DIR, name)
+    if os.path.exists(path):
+        raise FileExistsError(f"Backup {name} already exists")
+    source = sqlite3.connect("game.db", timeout=30)
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target, pages=BACKUP_PAGES, sleep=0.01)
+        # The copy inherits WAL mode; switch it back so each snapshot is a single standalone file.
+        target.execute("PRAGMA journal_mode=DELETE")
+        # Fold what it can of the WAL back into game.db without waiting on readers or the writer lock.
+        source.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    finally:
+        target.close()
+        source.close()
+
+    # Drop the oldest snapshots beyond the retention limit.
+    snapshots = list_backups()
+    protected = {name, *keep}
+    excess = len(snapshots) - BACKUP_KEEP
+    for old in snapshots:
+        if excess <= 0:
+            break
+        if old not in protected:
+            remove_backup(old)
+            excess -= 1
+    return name
+
+# Roll game.db back to a snapshot, copying a few pages at a time through its own connection.
+# A snapshot of the current state is taken first so the restore can be undone; returns its name,
+# or None if the snapshot doesn't exist. Only the database is rolled back: the bot must call
+# reload_game_state() afterwards.
+def restore_database(name):
+    if name not in list_backups():
+        return None
+    # Open read-only, so a missing file is an error rather than a new empty database,
+    # and read it before the safety backup prunes anything.
+    snapshot = sqlite3.connect(f"file:{os.path.join(BACKUP_DIR, name)}?mode=ro", uri=True)
+    try:
+        snapshot.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        safety = backup_database(keep=(name,))
+        target = sqlite3.connect("game.db", timeout=30)
+        try:
+            snapshot.backup(target, pages=BACKUP_PAGES, sleep=0.01)
+        finally:
+            target.close()
+    finally:
+        snapshot.close()
+    return safety
+
+# Command line restore, handled before connecting to Google Sheets or Discord.
+if len(sys.argv) > 1 and sys.argv[1] == "--restore":
+    if len(sys.argv) < 3:
+        print("Usage: python bot.py --restore <snapshot>")
+        print("Stop the bot first; a running bot keeps its old state in memory and keeps writing to game.db.")
+        print("Available backups (newest last):")
+        for name in list_backups():
+            print(name)
+    else:
+        print("Make sure the bot is stopped; a running bot would keep its old state in memory.")
+        safety = restore_database(sys.argv[2])
+        if safety is None:
+            print(f"Backup {sys.argv[2]} not found.")
+        else:
+            print(f"Database restored from {sys.argv[2]}. The previous state was saved as {safety}.")
+    sys.exit(0)
+
+# Rate limits per command: [burst size, seconds to refill the full burst] for each user and each team.
+# Settings in config.json override these defaults per command and scope.
+RATE_LIMITS = {
+    "submit": {"user": [3, 60], "team": [6, 60]},
+    "my_tasks": {"user": [5, 30], "team": [15, 30]},
+    "leaderboard": {"user": [5, 30], "team": [15, 30]},
+}
+for command, limits in config.get("rate_limits", {}).items():
+    RATE_LIMITS[command] = {**RATE_LIMITS.get(command, {}), **limits}
+rate_buckets = {}  # (command, scope, id) -> (tokens, last refill time)
+
+# In-memory copy of users.team_id so team rate limits can be checked without touching the database.
+user_teams = {}
+
+def load_user_teams():
+    user_teams.clear()
+    cursor.execute("SELECT discord_id, team_id FROM users")
+    for discord_id, team_id in cursor.fetchall():
+        user_teams[discord_id] = team_id
+
+load_user_teams()
+
 # Google Sheets setup
 scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
 credentials = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
@@ -61,11 +195,111 @@ def load_tasks_from_sheet(sheet_name):
             judge = task["Judge"]
             cursor.execute("INSERT INTO tasks (location, description, points, judge) VALUES (?, ?, ?, ?)", (location, description, points, judge))
         db.commit()
+        build_task_index()
         return True
     except Exception as e:
         print(f"Error loading tasks from sheet: {e}")
         return False
 
+# In-memory search index over task descriptions, rebuilt whenever tasks are loaded.
+indexed_tasks = {}  # task id -> (location, description, points)
+task_tokens = {}  # word -> set of task ids
+task_trigrams = {}  # trigram -> set of task ids
+location_tasks = {}  # location -> sorted list of task ids
+
+def tokenize(text):
+    return re.findall(r"\w+", str(text).lower())
+
+def trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def build_task_index():
+    indexed_tasks.clear()
+    task_tokens.clear()
+    task_trigrams.clear()
+    location_tasks.clear()
+    cursor.execute("SELECT id, location, description, points FROM tasks ORDER BY id")
+    for task_id, location, description, points in cursor.fetchall():
+        indexed_tasks[task_id] = (location, description, points)
+        location_tasks.setdefault(location, []).append(task_id)
+        for word in tokenize(description):
+            task_tokens.setdefault(word, set()).add(task_id)
+            for gram in trigrams(word):
+                task_trigrams.setdefault(gram, set()).add(task_id)
+
+# Rank tasks in a location by task ID prefix, whole-word and trigram overlap with the query.
+def search_tasks(query, location, limit=25):
+    words = tokenize(query)
+    if not words:
+        return location_tasks.get(location, [])[:limit]
+
+    scores = {}
+    for word in words:
+        if word.isdigit():
+            for task_id in location_tasks.get(location, ()):
+                if str(task_id) == word:
+                    scores[task_id] = scores.get(task_id, 0) + 10
+                elif str(task_id).startswith(word):
+                    scores[task_id] = scores.get(task_id, 0) + 5
+        for task_id in task_tokens.get(word, ()):
+            scores[task_id] = scores.get(task_id, 0) + 3
+        for gram in trigrams(word):
+            for task_id in task_trigrams.get(gram, ()):
+                scores[task_id] = scores.get(task_id, 0) + 1
+
+    matches = [task_id for task_id in scores if indexed_tasks[task_id][0] == location]
+    matches.sort(key=lambda task_id: (-scores[task_id], task_id))
+    return matches[:limit]
+
+build_task_index()
+
+# Submission counters for the admin dashboard, updated at every status change instead of scanning submissions.
+# A submission only counts as Pending once its photo is stored and it is waiting in the review queue.
+submission_counts = {}  # (team_id, location) -> {"Pending": n, "Accepted": n, "Denied": n}
+pending_since = {}  # (team_id, task_id) -> (location, time the photo was submitted for review)
+
+# old_status must be read right before the matching UPDATE, with no await in between.
+# since is set once the photo is uploaded and the submission joins the review queue.
+def record_status_change(team_id, task_id, location, old_status, new_status, since=None):
+    counts = submission_counts.setdefault((team_id, location), {"Pending": 0, "Accepted": 0, "Denied": 0})
+    queued = (team_id, task_id) in pending_since
+    if old_status in counts and (old_status != "Pending" or queued):
+        counts[old_status] -= 1
+    if new_status == "Pending" and since is not None:
+        counts["Pending"] += 1
+        pending_since[(team_id, task_id)] = (location, since)
+    else:
+        if new_status != "Pending":
+            counts[new_status] += 1
+        pending_since.pop((team_id, task_id), None)
+
+# Returns None if the submission or its team no longer exists.
+def get_submission_status(team_id, task_id):
+    cursor.execute(
+        "SELECT s.status FROM submissions s JOIN teams ON teams.id = s.team_id WHERE s.team_id = ? AND s.task_id = ?",
+        (team_id, task_id)
+    )
+    result = cursor.fetchone()
+    return result[0] if result else None
+
+# Seed the counters from the database. Only run at startup and after a restore.
+def load_submission_counts():
+    submission_counts.clear()
+    pending_since.clear()
+    cursor.execute(
+        """
+        SELECT s.team_id, s.task_id, t.location, s.status, s.pending_since
+        FROM submissions s
+        JOIN tasks t ON t.id = s.task_id
+        JOIN teams ON teams.id = s.team_id
+        """
+    )
+    for team_id, task_id, location, status, since in cursor.fetchall():
+        record_status_change(team_id, task_id, location, None, status, since)
+
+load_submission_counts()
+
 # New helper: get tasks along with submission status for a team and location.
 def get_tasks_with_status(team_id, location):
     cursor.execute(
@@ -102,10 +336,57 @@ def update_points(team_id, points):
 def add_user_to_team(user_id, team_id):
     cursor.execute("INSERT INTO users (discord_id, team_id) VALUES (?, ?)", (user_id, team_id))
     db.commit()
+    user_teams[user_id] = team_id
+
+# Token bucket check for a command. Tokens are only taken when both the user and team buckets have one.
+def take_rate_token(command, user_id):
+    limits = RATE_LIMITS.get(command)
+    if not limits:
+        return True
+    buckets = []
+    if "user" in limits:
+        buckets.append(((command, "user", user_id), limits["user"]))
+    team_id = user_teams.get(user_id)
+    if team_id is not None and "team" in limits:
+        buckets.append(((command, "team", team_id), limits["team"]))
+
+    now = time.monotonic()
+    refilled = []
+    for key, (capacity, per) in buckets:
+        tokens, last = rate_buckets.get(key, (capacity, now))
+        refilled.append((key, min(capacity, tokens + (now - last) * capacity / per)))
+    allowed = all(tokens >= 1 for _, tokens in refilled)
+    for key, tokens in refilled:
+        rate_buckets[key] = (tokens - 1 if allowed else tokens, now)
+    return allowed
+
+async def check_rate_limit(interaction: discord.Interaction, command):
+    if take_rate_token(command, interaction.user.id):
+        return True
+    await interaction.response.send_message("Slow down! You're using this command too quickly. Please try again in a moment.", ephemeral=True)
+    return False
+
+# Reload everything kept in memory from game.db after it has been restored.
+def reload_game_state():
+    migrate_submissions()
+    load_user_teams()
+    build_task_index()
+    load_submission_counts()
+
+async def backup_loop():
+    while True:
+        await asyncio.sleep(BACKUP_INTERVAL)
+        try:
+            name = await asyncio.to_thread(backup_database)
+            print(f"Database backed up to {name}")
+        except Exception as e:
+            print(f"Error backing up database: {e}")
 
 # Event listeners
 @bot.event
 async def setup_hook():
+    global backup_task
+    backup_task = asyncio.create_task(backup_loop())
     try:
         synced = await bot.tree.sync()
         print("Synced Commands: " + str(synced))
@@ -186,7 +467,7 @@ async def start_game(interaction: discord.Interaction, location: int):
     user_ids = cursor.fetchall()  # List of tuples like [(discord_id,), (discord_id,), ...]
     instruction_message = (
         f"Hello!\n\nThe game has started for location {location}!\n\n"
-        "Use `/my_tasks` to view your tasks.\n\n"
+        "Use `/my_tasks` to view your tasks, or `/find_task` to search them by description.\n\n"
         "When you're ready to submit a task, use `/submit task_id:<your task id>` and follow the prompts to upload your photo.\n\n"
         "You can also check out the leaderboard using `/leaderboard` to see how your team is doing.\n\n"
         "Good luck!"
@@ -222,6 +503,8 @@ async def load_tasks(interaction: discord.Interaction, sheet_name: str):
 
 @tree.command(name="my_tasks", description="View your tasks for the current location along with their completion status")
 async def my_tasks(interaction: discord.Interaction):
+    if not await check_rate_limit(interaction, "my_tasks"):
+        return
     await interaction.response.defer(ephemeral=True)
     user_id = interaction.user.id
     cursor.execute("SELECT team_id FROM users WHERE discord_id = ?", (user_id,))
@@ -265,6 +548,8 @@ async def my_tasks(interaction: discord.Interaction):
 @tree.command(name="submit", description="Submit your task photo using task ID")
 @app_commands.describe(task_id="The ID of the task you are submitting for")
 async def submit(interaction: discord.Interaction, task_id: int):
+    if not await check_rate_limit(interaction, "submit"):
+        return
     await interaction.response.defer(ephemeral=True)
     user_id = interaction.user.id
     cursor.execute("SELECT id, team_id FROM users WHERE discord_id = ?", (user_id,))
@@ -327,17 +612,27 @@ async def submit(interaction: discord.Interaction, task_id: int):
             except Exception as e:
                 print(f"Error fetching or editing old message: {e}")
 
-    # Insert or update the submission record.
+    # Insert or update the submission record. The status may have changed while the old message was edited.
+    if user_teams.get(user_id) != team_id:
+        await interaction.followup.send("You are not assigned to a team!", ephemeral=True)
+        return
+    old_status = get_submission_status(team_id, task_id)
+    if old_status == "Accepted":
+        await interaction.followup.send(
+            "Your submission for this task has already been accepted. Resubmission is not allowed.", ephemeral=True
+        )
+        return
     cursor.execute(
         """
-        INSERT INTO submissions (team_id, task_id, status, message_id, photo_url)
-        VALUES (?, ?, 'Pending', NULL, NULL)
+        INSERT INTO submissions (team_id, task_id, status, message_id, photo_url, pending_since)
+        VALUES (?, ?, 'Pending', NULL, NULL, NULL)
         ON CONFLICT(team_id, task_id)
-        DO UPDATE SET status = 'Pending', photo_url = NULL
+        DO UPDATE SET status = 'Pending', photo_url = NULL, pending_since = NULL
         """,
         (team_id, task_id)
     )
     db.commit()
+    record_status_change(team_id, task_id, task_location, old_status, "Pending")
 
     # Create first embed for Step 1 with a full-size image.
     instruction_embed1 = discord.Embed(
@@ -372,12 +667,27 @@ async def submit(interaction: discord.Interaction, task_id: int):
 
     photo_url = msg.attachments[0].url
 
-    # Update the photo URL in the database.
+    # Update the photo URL in the database; the submission now waits in the review queue.
+    # The submission or team may have been removed, e.g. by /restore or /remove_team, while we waited.
+    old_status = get_submission_status(team_id, task_id)
+    if old_status is None:
+        await interaction.followup.send("Your submission is no longer on record. Please submit again.", ephemeral=True)
+        return
+    if old_status == "Accepted":
+        await interaction.followup.send(
+            "Your submission for this task has already been accepted. Resubmission is not allowed.", ephemeral=True
+        )
+        return
+    submitted_at = time.time()
     cursor.execute(
-        "UPDATE submissions SET photo_url = ?, status = 'Pending' WHERE team_id = ? AND task_id = ?",
-        (photo_url, team_id, task_id)
+        "UPDATE submissions SET photo_url = ?, status = 'Pending', pending_since = ? WHERE team_id = ? AND task_id = ?",
+        (photo_url, submitted_at, team_id, task_id)
     )
     db.commit()
+    if cursor.rowcount == 0:
+        await interaction.followup.send("Your submission is no longer on record. Please submit again.", ephemeral=True)
+        return
+    record_status_change(team_id, task_id, task_location, old_status, "Pending", submitted_at)
     await interaction.followup.send("Photo submission complete!", ephemeral=True)
 
     # Notify the moderator channel with Accept and Deny buttons.
@@ -446,9 +756,21 @@ async def submit(interaction: discord.Interaction, task_id: int):
             else:
                 awarded_points = points
 
-            cursor.execute("UPDATE submissions SET status = 'Accepted' WHERE team_id = ? AND task_id = ?", (team_id, task_id))
+            # Re-check the status; another admin may have reviewed it while we waited for a score.
+            old_status = get_submission_status(team_id, task_id)
+            if old_status is None or old_status == "Accepted":
+                if interaction.response.is_done():
+                    await interaction.followup.send("This task is already marked as done.", ephemeral=True)
+                else:
+                    await interaction.response.send_message("This task is already marked as done.", ephemeral=True)
+                for child in review_view.children:
+                    child.disabled = True
+                await interaction.message.edit(view=review_view)
+                return
+            cursor.execute("UPDATE submissions SET status = 'Accepted', pending_since = NULL WHERE team_id = ? AND task_id = ?", (team_id, task_id))
             cursor.execute("UPDATE teams SET points = points + ? WHERE id = ?", (awarded_points, team_id))
             db.commit()
+            record_status_change(team_id, task_id, location, old_status, "Accepted")
             await interaction.response.send_message("Submission accepted and points added.", ephemeral=True)
 
             cursor.execute("SELECT discord_id FROM users WHERE team_id = ?", (team_id,))
@@ -496,8 +818,17 @@ async def submit(interaction: discord.Interaction, task_id: int):
                 return
 
             denial_reason = msg.content
-            cursor.execute("UPDATE submissions SET status = 'Denied' WHERE team_id = ? AND task_id = ?", (team_id, task_id))
+            # Re-check the status; another admin may have reviewed it while we waited for a reason.
+            old_status = get_submission_status(team_id, task_id)
+            if old_status is None or old_status in ("Accepted", "Denied"):
+                await interaction.followup.send("This task is already marked", ephemeral=True)
+                for child in review_view.children:
+                    child.disabled = True
+                await interaction.message.edit(view=review_view)
+                return
+            cursor.execute("UPDATE submissions SET status = 'Denied', pending_since = NULL WHERE team_id = ? AND task_id = ?", (team_id, task_id))
             db.commit()
+            record_status_change(team_id, task_id, task_location, old_status, "Denied")
 
             submitter = await interaction.client.fetch_user(user_id)
             await submitter.send(f"Submission denied for Task ID {task_id}. Reason: {denial_reason}")
@@ -521,6 +852,28 @@ async def submit(interaction: discord.Interaction, task_id: int):
         except discord.NotFound:
             await interaction.followup.send("Failed to post the message for review.", ephemeral=True)
 
+@submit.autocomplete("task_id")
+async def submit_task_id_autocomplete(interaction: discord.Interaction, current: str):
+    choices = []
+    for task_id in search_tasks(current, Game_status):
+        _location, description, points = indexed_tasks[task_id]
+        choices.append(app_commands.Choice(name=f"{task_id}: {description} ({points} points)"[:100], value=task_id))
+    return choices
+
+@tree.command(name="find_task", description="Search the current location's tasks by description")
+@app_commands.describe(query="Words from the task description")
+async def find_task(interaction: discord.Interaction, query: str):
+    matches = search_tasks(query, Game_status, limit=10)
+    if not matches:
+        await interaction.response.send_message("No matching tasks found.", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="Matching Tasks", description=f"Tasks matching '{query}':")
+    for task_id in matches:
+        _location, description, points = indexed_tasks[task_id]
+        embed.add_field(name=f"Task ID: {task_id}", value=f"{description} ({points} points)", inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
 @tree.command(name="toggle_leaderboard", description="Toggle the visibility of the leaderboard")
 async def toggle_leaderboard(interaction: discord.Interaction):
     # Check if the command is used in a DM
@@ -548,6 +901,8 @@ def fetch_leaderboard():
 
 @tree.command(name="leaderboard", description="View the current leaderboard")
 async def leaderboard(interaction: discord.Interaction):
+    if not await check_rate_limit(interaction, "leaderboard"):
+        return
     await interaction.response.defer()
     leaderboard_data = fetch_leaderboard()
 
@@ -730,11 +1085,78 @@ async def remove_team(interaction: discord.Interaction, team_id: int):
     cursor.execute("DELETE FROM teams WHERE id = ?", (team_id,))
     cursor.execute("DELETE FROM users WHERE team_id = ?", (team_id,))
     db.commit()
+    load_user_teams()
+    for key in [key for key in submission_counts if key[0] == team_id]:
+        del submission_counts[key]
+    for key in [key for key in pending_since if key[0] == team_id]:
+        del pending_since[key]
     await interaction.followup.send(f"Team with ID {team_id} has been removed.", ephemeral=True)
 
 
+@tree.command(name="game_status", description="Submission progress for each team at the current location (Game Admin only)")
+async def game_status(interaction: discord.Interaction):
+    await interaction.response.defer(ephemeral=True)
+    # Only allow command if used in a guild by a Game Admin
+    if interaction.guild is None or not any(role.name == "Game Admin" for role in interaction.user.roles):
+        await interaction.followup.send("You are not authorized to use this command.", ephemeral=True)
+        return
+
+    # Only photos already submitted count as pending, so the team 🟡 counts add up to this total.
+    queued = [since for location, since in pending_since.values() if location == Game_status]
+    if queued:
+        oldest_minutes = int(time.time() - min(queued)) // 60
+        backlog = f"Pending review at this location: {len(queued)} (oldest waiting {oldest_minutes} min)"
+    else:
+        backlog = "Pending review at this location: 0"
+    task_count = sum(1 for location, _description, _points in indexed_tasks.values() if location == Game_status)
+    response_message = f"**Game Status - Location {Game_status}**\n{backlog}\nTasks at this location: {task_count}\n\n"
+
+    cursor.execute("SELECT id, name FROM teams")
+    for team_id, team_name in cursor.fetchall():
+        counts = submission_counts.get((team_id, Game_status), {"Pending": 0, "Accepted": 0, "Denied": 0})
+        response_message += f"**{team_name}** (ID: {team_id}): ✅ {counts['Accepted']}  🟡 {counts['Pending']}  ❌ {counts['Denied']}\n"
+    await interaction.followup.send(response_message[:2000], ephemeral=True)
+
+@tree.command(name="restore", description="Roll the game database back to a backup snapshot (Game Admin only)")
+@app_commands.describe(snapshot="The snapshot to restore; leave empty to list available snapshots")
+async def restore(interaction: discord.Interaction, snapshot: str = None):
+    await interaction.response.defer(ephemeral=True)
+    # Only allow command if used in a guild by a Game Admin
+    if interaction.guild is None or not any(role.name == "Game Admin" for role in interaction.user.roles):
+        await interaction.followup.send("You are not authorized to use this command.", ephemeral=True)
+        return
 
+    snapshots = list_backups()
+    if snapshot is None:
+        if not snapshots:
+            await interaction.followup.send("No backups available yet.", ephemeral=True)
+        else:
+            await interaction.followup.send("Available backups (newest last):\n" + "\n".join(snapshots[-20:]), ephemeral=True)
+        return
+
+    # Only game.db is rolled back. The active location, leaderboard visibility and any review
+    # messages or submit prompts still open keep their current state.
+    try:
+        safety = await asyncio.to_thread(restore_database, snapshot)
+        if safety is not None:
+            reload_game_state()
+    except Exception as e:
+        print(f"Error restoring database: {e}")
+        await interaction.followup.send(f"Failed to restore {snapshot}.", ephemeral=True)
+        return
+    if safety is None:
+        await interaction.followup.send(f"Backup {snapshot} not found.", ephemeral=True)
+        return
+    await interaction.followup.send(
+        f"Database restored from {snapshot}. The previous state was saved as {safety}.\n"
+        "The active location, leaderboard visibility and open review messages were not rolled back.",
+        ephemeral=True
+    )
 
+@restore.autocomplete("snapshot")
+async def restore_snapshot_autocomplete(interaction: discord.Interaction, current: str):
+    snapshots = [name for name in reversed(list_backups()) if current in name]
+    return [app_commands.Choice(name=name, value=name) for name in snapshots[:25]]
 
 
 bot.run(config['bot_token'])